@@ -1,7 +1,14 @@
 # backend/main.py
 
 import os  # <-- ADD THIS IMPORT
-from fastapi import FastAPI
+import asyncio
+import logging
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from fastapi import BackgroundTasks, FastAPI
+from fastapi.responses import StreamingResponse
+from redis.asyncio import Redis
+import orjson
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import processing # Import our helper functions
@@ -27,52 +34,260 @@ class RoadmapRequest(BaseModel):
     topic: str
     level: str
 
-# --- API Endpoints ---
-@app.post("/generate")
-def generate_notes_endpoint(request: VideoRequest):
+# --- Result Cache ---
+# Finished results are cached in Redis so a video (or roadmap) the server has already
+# processed is answered with a single GET. Caching is disabled when REDIS_URL is unset.
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_TTL_SECONDS = 86400 * 7
+# Results missing their audio preview (gTTS failed) are only kept briefly so it gets retried.
+INCOMPLETE_CACHE_TTL_SECONDS = 3600
+cache = Redis.from_url(REDIS_URL) if REDIS_URL else None
+
+async def cache_get(key: str) -> Optional[Dict]:
+    """Returns the cached JSON value for a key, or None on a miss or cache error."""
+    if cache is None:
+        return None
+    try:
+        cached = await cache.get(key)
+        return orjson.loads(cached) if cached else None
+    except Exception as e:
+        logging.warning(f"Redis lookup failed for '{key}': {e}")
+        return None
+
+async def cache_set(key: str, value: Dict, ttl_seconds: int = CACHE_TTL_SECONDS):
+    """Stores a JSON value in the cache; failures are logged and ignored."""
+    if cache is None:
+        return
+    try:
+        await cache.set(key, orjson.dumps(value), ex=ttl_seconds)
+    except Exception as e:
+        logging.warning(f"Redis write failed for '{key}': {e}")
+
+# --- In-Memory Job Store ---
+# The pipeline takes minutes, so /generate only enqueues a job. Clients either poll
+# /job/{job_id} or follow /job/{job_id}/events, an NDJSON stream that delivers the notes
+# while Gemini is still writing them. The backend runs as a single container, so jobs
+# live in this process and are forgotten JOB_RETENTION_SECONDS after they finish.
+JOB_RETENTION_SECONDS = 600
+EVENT_HEARTBEAT_SECONDS = 15
+# A job still running after this long is failed, so a hung download or model call
+# cannot keep its clients (and everyone sharing it) waiting forever.
+JOB_DEADLINE_SECONDS = int(os.getenv("JOB_DEADLINE_SECONDS", "1800"))
+jobs: Dict[str, Dict] = {}
+job_streams: Dict[str, Dict] = {}
+# Cache key -> (job id, start time) of the job currently processing that video, so students
+# pasting the same URL at the same time share one pipeline run instead of starting one each.
+in_flight_jobs: Dict[str, Tuple[str, float]] = {}
+
+async def publish_event(job_id: str, event: Dict):
+    """Appends an event to the job's stream and wakes up every listener."""
+    stream = job_streams.get(job_id)
+    if stream is None:
+        return
+    async with stream["updated"]:
+        stream["events"].append(event)
+        stream["updated"].notify_all()
+
+def forget_job(job_id: str):
+    """Drops a finished job and its event stream."""
+    jobs.pop(job_id, None)
+    job_streams.pop(job_id, None)
+
+async def stream_job_notes(job_id: str, transcript: str) -> Tuple[str, Dict[str, asyncio.Task]]:
     """
-    This endpoint takes a YouTube URL, runs the full processing pipeline,
-    and returns all the generated content.
+    Streams the notes from Gemini into the job's events and returns the full text.
+    As soon as the summary section is complete its audio preview is synthesized in the
+    background; the second return value maps that summary snippet to the running task.
     """
-    audio_file_path = "Target_audio.mp3"
+    notes_text = ""
+    fence_count = 0
+    sent_items = set()
+    # notes_text up to here has already been searched for new '##' headings.
+    scanned = 0
+    summary_audio_tasks: Dict[str, asyncio.Task] = {}
+    async for chunk_text in processing.stream_notes(transcript):
+        notes_text += chunk_text
+        await publish_event(job_id, {"event": "notes", "text": chunk_text})
+        # A code fence just closed: send any quiz or concept map that is now complete.
+        new_fence_count = notes_text.count("```")
+        if new_fence_count != fence_count and new_fence_count % 2 == 0:
+            content = processing.parse_notes(notes_text, partial=True)
+            for item in ("mcq_questions", "flashcard_questions", "graphviz_data"):
+                if content[item] and item not in sent_items:
+                    sent_items.add(item)
+                    await publish_event(job_id, {"event": item, item: content[item]})
+        fence_count = new_fence_count
+        # Every section before the latest heading is complete; once that includes the
+        # summary, start the text-to-speech while Gemini keeps writing. Only a heading that
+        # ends in the new text triggers a re-parse (a chunk can split the "\n##").
+        if summary_audio_tasks:
+            continue
+        last_heading = notes_text.rfind("\n##", max(scanned - 2, 0))
+        scanned = len(notes_text)
+        if last_heading > 0:
+            summary_snippet = processing.parse_notes(notes_text[:last_heading], partial=True)["summary_snippet"]
+            if summary_snippet:
+                summary_audio_tasks[summary_snippet] = asyncio.create_task(
+                    asyncio.to_thread(processing.synthesize_speech, summary_snippet)
+                )
+    return notes_text, summary_audio_tasks
+
+async def run_pipeline(job_id: str, video_url: str, cache_key: Optional[str]) -> Dict:
+    """Runs the full processing pipeline for one job, off the event loop, and returns its result."""
+    # 1. Process Video (audio is streamed into memory, nothing touches the disk).
+    # The transcription workers are warmed up while the audio downloads.
+    audio, _ = await asyncio.gather(
+        asyncio.to_thread(processing.video_to_audio, video_url),
+        asyncio.to_thread(processing.warm_up_transcription),
+    )
+    transcript = await asyncio.to_thread(processing.audio_to_text, audio)
+
+    # 2. Generate Notes & Topic, streaming them to listeners as they arrive
+    notes_text, summary_audio_tasks = await stream_job_notes(job_id, transcript)
+
+    # 3. Parse Content (a single pass over the notes)
+    content = processing.parse_notes(notes_text)
+
+    # 4. Collect the audio preview, normally already synthesized during streaming
+    summary_audio_b64 = None
+    summary_snippet = content["summary_snippet"]
+    if summary_snippet in summary_audio_tasks:
+        summary_audio_b64 = await summary_audio_tasks[summary_snippet]
+    elif summary_snippet:
+        summary_audio_b64 = await asyncio.to_thread(processing.synthesize_speech, summary_snippet)
+
+    # 5. Store everything as the job result
+    result = {
+        "status": "success",
+        "notes": notes_text,
+        "mcq_questions": content["mcq_questions"],
+        "flashcard_questions": content["flashcard_questions"],
+        "graphviz_data": content["graphviz_data"],
+        "topic": content["topic"],
+        "summary_audio_b64": summary_audio_b64
+    }
+    if cache_key:
+        audio_missing = content["summary_snippet"] and not summary_audio_b64
+        await cache_set(cache_key, result, INCOMPLETE_CACHE_TTL_SECONDS if audio_missing else CACHE_TTL_SECONDS)
+    return result
+
+async def run_generate_job(job_id: str, video_url: str, cache_key: Optional[str]):
+    """Runs one job within JOB_DEADLINE_SECONDS and publishes its result or error."""
+    jobs[job_id]["status"] = "running"
+    await publish_event(job_id, {"event": "status", "status": "running"})
     try:
-        # 1. Process Video
-        processing.video_to_audio(request.video_url, audio_file_path)
-        transcript = processing.audio_to_text(audio_file_path)
-
-        # 2. Generate Notes & Topic
-        notes_text = processing.generate_notes(transcript)
-        
-        # 3. Parse Content
-        mcq_questions = processing.parse_quiz_from_json(notes_text, key="MCQ Quiz")
-        flashcard_questions = processing.parse_quiz_from_json(notes_text, key="Flashcard Review")
-        graphviz_data = processing.parse_graphviz(notes_text)
-
-        # 5. Return everything in a JSON response
-        return {
-            "status": "success",
-            "notes": notes_text,
-            "mcq_questions": mcq_questions,
-            "flashcard_questions": flashcard_questions,
-            "graphviz_data": graphviz_data
-        }
+        result = await asyncio.wait_for(run_pipeline(job_id, video_url, cache_key), JOB_DEADLINE_SECONDS)
+        jobs[job_id] = result
+        await publish_event(job_id, {"event": "done", **result})
+    except asyncio.TimeoutError:
+        jobs[job_id] = {"status": "error", "message": f"Processing did not finish within {JOB_DEADLINE_SECONDS} seconds."}
+        await publish_event(job_id, {"event": "error", **jobs[job_id]})
     except Exception as e:
-        return {"status": "error", "message": str(e)}
+        jobs[job_id] = {"status": "error", "message": str(e)}
+        await publish_event(job_id, {"event": "error", **jobs[job_id]})
     finally:
-        # 4. Clean up the audio file in all cases (success or error)
-        if os.path.exists(audio_file_path):
-            os.remove(audio_file_path)
+        if cache_key and in_flight_jobs.get(cache_key, (None,))[0] == job_id:
+            del in_flight_jobs[cache_key]
+        asyncio.get_running_loop().call_later(JOB_RETENTION_SECONDS, forget_job, job_id)
+
+# --- YouTube Search Concurrency ---
+# Roadmap searches run in worker threads; this bounds how many hit the YouTube API at once.
+youtube_search_slots = asyncio.Semaphore(8)
+
+# --- API Endpoints ---
+@app.post("/generate")
+async def generate_notes_endpoint(request: VideoRequest, background_tasks: BackgroundTasks) -> Dict[str, Any]:
+    """
+    This endpoint takes a YouTube URL, queues the full processing pipeline,
+    and immediately returns a job id to poll via /job/{job_id}
+    or to follow via /job/{job_id}/events.
+    Videos that were already processed are answered from the cache, and
+    videos that are being processed right now share the running job.
+    """
+    video_id = processing.extract_video_id(request.video_url)
+    cache_key = f"notes:{video_id}" if video_id else None
+    if cache_key:
+        cached = await cache_get(cache_key)
+        if cached:
+            return cached
+        in_flight = in_flight_jobs.get(cache_key)
+        # An entry older than the deadline belongs to a job that never cleaned up; start afresh.
+        if in_flight and asyncio.get_running_loop().time() - in_flight[1] < JOB_DEADLINE_SECONDS:
+            return {"status": "queued", "job_id": in_flight[0]}
+
+    job_id = uuid.uuid4().hex
+    jobs[job_id] = {"status": "queued"}
+    job_streams[job_id] = {"events": [], "updated": asyncio.Condition()}
+    if cache_key:
+        in_flight_jobs[cache_key] = (job_id, asyncio.get_running_loop().time())
+    background_tasks.add_task(run_generate_job, job_id, request.video_url, cache_key)
+    return {"status": "queued", "job_id": job_id}
+
+@app.get("/job/{job_id}")
+async def get_job_endpoint(job_id: str) -> Dict[str, Any]:
+    """
+    This endpoint returns the state of a job; once finished it returns
+    the generated content (or the error). A job can be shared by several
+    clients, so it is kept until JOB_RETENTION_SECONDS after it finishes.
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        return {"status": "error", "message": f"Unknown job id: {job_id}"}
+    return job
+
+@app.get("/job/{job_id}/events")
+async def stream_job_events_endpoint(job_id: str):
+    """
+    This endpoint streams a job's progress as NDJSON events: the notes text
+    as it is generated, each quiz or concept map once it is complete, and a
+    final "done" (with the full result) or "error" event.
+    """
+    stream = job_streams.get(job_id)
+    if stream is None:
+        return {"status": "error", "message": f"Unknown job id: {job_id}"}
+
+    async def event_lines() -> AsyncIterator[bytes]:
+        events: List[Dict] = stream["events"]
+        sent = 0
+        while True:
+            async with stream["updated"]:
+                if sent == len(events):
+                    try:
+                        await asyncio.wait_for(stream["updated"].wait(), EVENT_HEARTBEAT_SECONDS)
+                    except asyncio.TimeoutError:
+                        pass
+                new_events = events[sent:]
+            if not new_events:
+                # Transcription can take minutes; keep the connection alive meanwhile.
+                yield orjson.dumps({"event": "heartbeat"}) + b"\n"
+                continue
+            for event in new_events:
+                yield orjson.dumps(event) + b"\n"
+                if event["event"] in ("done", "error"):
+                    return
+            sent += len(new_events)
+
+    return StreamingResponse(event_lines(), media_type="application/x-ndjson")
 
 @app.post("/roadmap")
-def generate_roadmap_endpoint(request: RoadmapRequest):
+async def generate_roadmap_endpoint(request: RoadmapRequest) -> Dict[str, Any]:
     """
     This endpoint takes a topic and level and returns video recommendations.
     """
+    cache_key = f"roadmap:{request.topic.strip().lower()}:{request.level.strip().lower()}"
+    cached = await cache_get(cache_key)
+    if cached:
+        return cached
     try:
-        recommendations = processing.get_youtube_recommendations(
-            topic=request.topic, 
-            level=request.level
-        )
-        return {"status": "success", "recommendations": recommendations}
+        async with youtube_search_slots:
+            recommendations = await asyncio.to_thread(
+                processing.get_youtube_recommendations,
+                topic=request.topic,
+                level=request.level
+            )
+        response = {"status": "success", "recommendations": recommendations}
+        if recommendations:
+            await cache_set(cache_key, response)
+        return response
     except Exception as e:
         return {"status": "error", "message": str(e)}
\ No newline at end of file
@@ -0,0 +1,75 @@
+# backend/notes_parser.py
+
+# Parsing of the Gemini notes into the structured content the app displays. It has no
+# heavy dependencies, so it can be imported (and tested) without loading any models.
+
+import re
+import logging
+import orjson
+from typing import Optional, List, Dict
+
+# One section per '##' (or deeper) heading: its level, header line and everything up to the
+# next heading of any level, so '### MCQ Quiz' under a '## Quiz' heading is a section of its own.
+SECTION_RE = re.compile(r'^(?P<level>#{2,})[ \t]*(?P<header>[^\n]*)\n?(?P<body>.*?)(?=^#{2,}|\Z)', re.MULTILINE | re.DOTALL)
+FENCE_RE = re.compile(r"```(?P<lang>\w*)\s*(?P<code>[\s\S]+?)\s*```")
+
+def parse_notes(notes_text: str, partial: bool = False) -> Dict:
+    """
+    Walks the notes once and extracts the quizzes, concept map, topic and summary snippet.
+    With partial=True the notes are still streaming in, so missing sections are expected.
+    """
+    sections = []
+    for match in SECTION_RE.finditer(notes_text):
+        fences = {}
+        for fence in FENCE_RE.finditer(match.group('body')):
+            fences.setdefault(fence.group('lang').lower(), fence.group('code'))
+        sections.append((len(match.group('level')), match.group('header').strip().lower(), match.group('body'), fences))
+
+    def find_section(*prefixes: str):
+        return next((section for section in sections if section[1].startswith(prefixes)), None)
+
+    def quiz(key: str) -> List[Dict]:
+        # A quiz heading owns the fences of its deeper sub-sections ('## MCQ Quiz' followed by
+        # '### Questions'), up to the next heading at the same or a higher level.
+        start = next((index for index, section in enumerate(sections) if section[1].startswith(key.lower())), None)
+        if start is None: return []
+        level = sections[start][0]
+        for index in range(start, len(sections)):
+            if index > start and sections[index][0] <= level: break
+            if 'json' in sections[index][3]: return parse_quiz_json(sections[index][3]['json'], key)
+        return []
+
+    dot_source = next((fences['dot'] for _, _, _, fences in sections if 'dot' in fences), None)
+    topic_section = next((section for section in sections if section[1] == "topic"), None)
+    summary_section = find_section("summary", "detailed summary")
+    if not topic_section and not partial:
+        logging.warning("Could not find a topic section in the notes.")
+    if not summary_section and not partial:
+        logging.warning("Could not find a summary in the notes for the audio preview.")
+
+    return {
+        "mcq_questions": quiz("MCQ Quiz"),
+        "flashcard_questions": quiz("Flashcard Review"),
+        "graphviz_data": style_graphviz(dot_source) if dot_source else None,
+        "topic": parse_topic(topic_section[2]) if topic_section else None,
+        "summary_snippet": " ".join(summary_section[2].split()[:10]) if summary_section else None,
+    }
+
+def style_graphviz(dot_source: str) -> str:
+    """Wraps the concept map in a digraph if needed and applies the app's styling."""
+    content = dot_source.strip()
+    if not content.startswith('digraph'): content = f'digraph G {{ {content} }}'
+    styling = 'bgcolor="transparent"; node [style="filled", shape="box", fillcolor="#AEC6CF", fontcolor="#121212", color="#FFFFFF", penwidth=2, fontname="Inter"]; edge [color="#FFFFFF", fontname="Inter"];'
+    return content.replace('{', f'{{ {styling}', 1)
+
+def parse_quiz_json(json_text: str, key: str) -> List[Dict]:
+    """Decodes the fenced JSON block of a quiz section; malformed JSON yields no questions."""
+    try: return orjson.loads(json_text)
+    except orjson.JSONDecodeError:
+        logging.warning(f"Failed to parse JSON for key: '{key}'")
+        return []
+
+def parse_topic(topic_body: str) -> Optional[str]:
+    """Returns the short search topic from the body of the '## Topic' section."""
+    first_line = next((line for line in topic_body.splitlines() if line.strip()), "")
+    return first_line.strip().strip('"*').strip() or None
@@ -1,22 +1,73 @@
 import os
 import re
-import json
 import logging
+import asyncio
+import functools
+import textwrap
+import base64
+from io import BytesIO
+import subprocess
+import threading
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dotenv import load_dotenv
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple, AsyncIterator
 
 # --- Explicit Imports to Satisfy Pylance ---
 # This is the most reliable way to make the linter stop showing errors.
 from google.generativeai.client import configure
 from google.generativeai.generative_models import GenerativeModel
 from googleapiclient.discovery import build
-from faster_whisper import WhisperModel
+import httplib2
 import yt_dlp
+from gtts import gTTS
+import transcription_worker
+from notes_parser import parse_notes
 # --- End of Imports ---
 
+# Transcripts longer than this are condensed segment by segment (map-reduce) before the
+# notes prompt, since Gemini latency and cost grow with input length.
+MAP_REDUCE_THRESHOLD_CHARS = 8000
+TRANSCRIPT_SEGMENT_CHARS = 8000
+# Segment summaries in flight at once across all jobs, so a long lecture does not burst
+# past the Gemini rate limit.
+segment_summary_slots = asyncio.Semaphore(4)
+
+# CPUs this process may actually run on (os.cpu_count() reports every core of the host).
+AVAILABLE_CPUS = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+
+# Whisper models expect 16 kHz mono audio, and were trained on 30-second windows.
+SAMPLE_RATE = 16000
+CHUNK_SECONDS = 30
+
+# Silence detection: 30 ms frames whose RMS energy stays under the threshold for at least
+# 500 ms mark a pause the audio can be cut at. The threshold is relative to the loud end
+# of the recording, so quiet lectures are detected as well as loud ones.
+VAD_FRAME_SAMPLES = SAMPLE_RATE * 30 // 1000
+MIN_SILENCE_FRAMES = 500 // 30
+SILENCE_RMS_RATIO = 0.1
+
+# A stalled stream must not hang a job forever: ffmpeg reconnects on dropped connections
+# and the whole download is abandoned after this many seconds.
+AUDIO_DOWNLOAD_TIMEOUT_SECONDS = int(os.getenv("AUDIO_DOWNLOAD_TIMEOUT_SECONDS", "900"))
+
 # --- Setup Logging ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# --- Persistent YouTube Connections ---
+# httplib2 keeps its HTTPS connection alive between calls but is not thread-safe, and the
+# roadmap search runs in worker threads. Each thread therefore builds one client of its
+# own and reuses it, instead of paying a TCP+TLS handshake on every search.
+youtube_clients = threading.local()
+
+def get_youtube_service():
+    """Returns this thread's YouTube client, building it on first use."""
+    if not hasattr(youtube_clients, "service"):
+        youtube_clients.service = build('youtube', 'v3', developerKey=api_key, http=httplib2.Http(timeout=30))
+    return youtube_clients.service
+
 # --- Load Environment Variables and Configure APIs ---
 try:
     load_dotenv()
@@ -30,79 +81,342 @@ try:
     
     # 1. Configure Google AI (Gemini) using the directly imported function
     configure(api_key=api_key)
+    gemini_model = GenerativeModel('gemini-1.5-flash-latest')
+    # A smaller, cheaper model condenses long transcripts before the main notes prompt.
+    segment_summary_model = GenerativeModel('gemini-1.5-flash-8b')
     logging.info("Successfully configured Google AI (Gemini) API key.")
 
     # 2. Configure YouTube Data API client
+    # (this builds the main thread's client; worker threads build their own on first use).
     try:
-        youtube_service = build('youtube', 'v3', developerKey=api_key)
+        get_youtube_service()
+        youtube_available = True
         logging.info("Successfully configured YouTube Data API client with the same key.")
     except Exception as e:
         logging.warning(f"Could not configure YouTube API (roadmap feature will be disabled): {e}")
-        youtube_service = None
+        youtube_available = False
 
 except Exception as e:
     logging.critical(f"Failed to configure APIs on startup: {e}")
     raise SystemExit(f"Could not configure essential APIs. Error: {e}")
 
+# --- Load the GPU Speech-to-Text Pipeline ---
+# On a CUDA host we transcribe with the batched HuggingFace pipeline: 30s chunks are
+# decoded in parallel instead of one segment at a time. torch/transformers are not in
+# requirements.txt (the CPU image does not need them); install them on GPU hosts.
+# Set WHISPER_ENGLISH_ONLY=1 to use the smaller distil-whisper checkpoint.
+# Pipelines (and the OpenVINO infer request behind them) are not thread-safe, so
+# concurrent jobs take turns calling asr_pipeline.
+asr_pipeline = None
+asr_pipeline_lock = threading.Lock()
+try:
+    import torch
+    from transformers import pipeline
+
+    if torch.cuda.is_available():
+        english_only = os.getenv("WHISPER_ENGLISH_ONLY", "").lower() in ("1", "true", "yes")
+        asr_model_id = "distil-whisper/distil-small.en" if english_only else "openai/whisper-base"
+        # Flash Attention 2 needs the flash-attn package and an Ampere (or newer) GPU.
+        try:
+            import flash_attn  # noqa: F401
+            use_flash_attention = torch.cuda.get_device_capability(0)[0] >= 8
+        except ImportError:
+            use_flash_attention = False
+        asr_pipeline = pipeline(
+            "automatic-speech-recognition",
+            model=asr_model_id,
+            torch_dtype=torch.float16,
+            device="cuda:0",
+            model_kwargs={"attn_implementation": "flash_attention_2" if use_flash_attention else "sdpa"},
+        )
+        logging.info(f"Loaded GPU transcription pipeline '{asr_model_id}' (flash attention: {use_flash_attention}).")
+except ImportError:
+    logging.info("torch/transformers not installed. Using whisper.cpp on CPU for transcription.")
+except Exception as e:
+    logging.warning(f"Could not load GPU transcription pipeline, falling back to whisper.cpp: {e}")
+    asr_pipeline = None
+
+# --- Load the OpenVINO INT8 Speech-to-Text Pipeline (CPU hosts) ---
+# Without a GPU, an INT8 OpenVINO IR of Whisper is an alternative to whisper.cpp on Xeon CPUs (VNNI).
+# Produce the IR once with NNCF post-training quantization and ship it with the image:
+#   optimum-cli export openvino --model openai/whisper-base --quant-mode int8 \
+#       --dataset librispeech --num-samples 50 whisper_base_int8_ov
+# Requires `optimum[openvino]`; if the IR directory is missing we keep whisper.cpp.
+openvino_model_dir = os.getenv("WHISPER_OPENVINO_DIR", "whisper_base_int8_ov")
+if asr_pipeline is None and os.path.isdir(openvino_model_dir):
+    try:
+        from optimum.intel import OVModelForSpeechSeq2Seq
+        from transformers import AutoProcessor, pipeline
+
+        ov_model = OVModelForSpeechSeq2Seq.from_pretrained(openvino_model_dir, device="CPU")
+        ov_processor = AutoProcessor.from_pretrained(openvino_model_dir)
+        asr_pipeline = pipeline(
+            "automatic-speech-recognition",
+            model=ov_model,
+            tokenizer=ov_processor.tokenizer,
+            feature_extractor=ov_processor.feature_extractor,
+        )
+        logging.info(f"Loaded OpenVINO INT8 transcription pipeline from '{openvino_model_dir}'.")
+    except Exception as e:
+        logging.warning(f"Could not load OpenVINO transcription pipeline, falling back to whisper.cpp: {e}")
+        asr_pipeline = None
+
+# --- Load the whisper.cpp Model Once ---
+# On CPU we run a Q5 quantized GGML build of whisper-base through whisper.cpp, whose
+# AVX2/AVX-512 kernels are faster and smaller than an INT8 CTranslate2 model. Loading
+# takes seconds, so it is done once at import and reused by every request.
+# whisper.cpp reuses one context (and its params) per model, so concurrent jobs must not
+# call WHISPER.transcribe at the same time.
+WHISPER = None
+whisper_lock = threading.Lock()
+if asr_pipeline is None:
+    WHISPER = transcription_worker.load_model(n_threads=AVAILABLE_CPUS)
+    logging.info(f"Loaded whisper.cpp model '{transcription_worker.WHISPER_CPP_MODEL}' on CPU.")
+
+# --- Parallel Transcription Pool ---
+# Long lectures are cut into speech chunks that are transcribed in parallel, one Whisper
+# model per worker process. The pool is started on first use and then kept alive.
+# Each worker holds its own model, so the count is capped by default; set
+# TRANSCRIPTION_WORKERS to match the container's CPU quota.
+TRANSCRIPTION_WORKERS = int(os.getenv("TRANSCRIPTION_WORKERS", "0")) or min(AVAILABLE_CPUS, 4)
+transcription_pool = None
+transcription_pool_lock = threading.Lock()
+
+def get_transcription_pool() -> ProcessPoolExecutor:
+    """Returns the shared transcription process pool, starting it on first use."""
+    global transcription_pool
+    with transcription_pool_lock:
+        if transcription_pool is None:
+            transcription_pool = ProcessPoolExecutor(
+                max_workers=TRANSCRIPTION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=transcription_worker.init_worker,
+            )
+        return transcription_pool
+
+def discard_transcription_pool(pool: ProcessPoolExecutor):
+    """Drops a broken pool (e.g. a worker was OOM-killed) so the next call starts a fresh one."""
+    global transcription_pool
+    with transcription_pool_lock:
+        if transcription_pool is pool:
+            transcription_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def warm_up_transcription():
+    """Starts the transcription workers and loads their models ahead of the first transcription."""
+    if asr_pipeline is not None:
+        return
+    pool = None
+    try:
+        pool = get_transcription_pool()
+        # Workers are spawned on demand; one ping per worker brings them all up at once.
+        pings = [pool.submit(transcription_worker.ping) for _ in range(TRANSCRIPTION_WORKERS)]
+        for ping in pings:
+            ping.result()
+    except BrokenProcessPool as e:
+        logging.warning(f"Transcription workers crashed during warm-up: {e}")
+        discard_transcription_pool(pool)
+    except Exception as e:
+        logging.warning(f"Could not warm up the transcription workers: {e}")
+
 
 # --- Core Processing Functions ---
 
-def video_to_audio(video_url: str, output_path: str = "Target_audio.mp3") -> str:
-    """Downloads and extracts audio from a YouTube URL."""
+def video_to_audio(video_url: str) -> np.ndarray:
+    """Streams the audio of a YouTube URL through ffmpeg into 16 kHz mono float32 PCM."""
     logging.info(f"Starting audio extraction for URL: {video_url}")
-    # ... (rest of function is correct)
-    output_template = f"{os.path.splitext(output_path)[0]}.%(ext)s"
+    # yt-dlp only resolves the direct audio stream URL; ffmpeg downloads and decodes it
+    # straight into memory, so no audio file is ever written to disk.
     ydl_opts = {
-        'format': 'bestaudio[ext=m4a]/bestaudio/best', 'outtmpl': output_template,
-        'postprocessors': [{'key': 'FFmpegExtractAudio', 'preferredcodec': 'mp3', 'preferredquality': '192'}],
-        'postprocessor_args': ['-ar', '16000', '-ac', '1'],
-        'prefer_ffmpeg': True, 'keepvideo': False, 'noplaylist': True, 'quiet': True, 'no_warnings': True,
+        'format': 'bestaudio[ext=m4a]/bestaudio/best',
+        'noplaylist': True, 'quiet': True, 'no_warnings': True,
     }
     try:
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([video_url])
-        if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
-            raise FileNotFoundError("Audio file was not created or is empty after download.")
-        logging.info(f"Audio extracted successfully to {output_path}")
-        return output_path
+            info = ydl.extract_info(video_url, download=False)
+        command = ["ffmpeg", "-nostdin", "-loglevel", "error"]
+        headers = "".join(f"{name}: {value}\r\n" for name, value in info.get('http_headers', {}).items())
+        if headers:
+            command += ["-headers", headers]
+        command += ["-reconnect", "1", "-reconnect_streamed", "1", "-reconnect_delay_max", "5"]
+        command += ["-i", info['url'], "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-"]
+        try:
+            process = subprocess.run(command, capture_output=True, timeout=AUDIO_DOWNLOAD_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"ffmpeg did not finish downloading the audio within {AUDIO_DOWNLOAD_TIMEOUT_SECONDS} seconds.")
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed to decode the audio stream: {process.stderr.decode(errors='replace').strip()}")
+        # Convert once and scale in place: a one-hour lecture is ~115 MB of s16le and
+        # ~230 MB as float32, so extra temporary arrays matter on small instances.
+        audio = np.frombuffer(process.stdout, np.int16).astype(np.float32)
+        del process
+        audio *= 1 / 32768
+        if audio.size == 0:
+            raise ValueError("Audio stream was empty after download.")
+        logging.info(f"Audio extracted successfully: {audio.size / SAMPLE_RATE:.0f} seconds.")
+        return audio
     except Exception as e:
         logging.error(f"yt-dlp failed for URL {video_url}. Error: {e}")
         raise e
 
-def audio_to_text(audio_path: str) -> str:
-    """Transcribes an audio file to text using Whisper."""
-    # ... (function is correct)
-    if not os.path.exists(audio_path):
-        raise FileNotFoundError(f"Audio file not found at path: {audio_path}")
+def find_speech_regions(audio: np.ndarray) -> List[Tuple[int, int]]:
+    """Returns (start, end) sample ranges of speech, separated by pauses of at least 500 ms."""
+    frame_count = audio.size // VAD_FRAME_SAMPLES
+    if frame_count == 0:
+        return []
+    frames = audio[:frame_count * VAD_FRAME_SAMPLES].reshape(frame_count, VAD_FRAME_SAMPLES)
+    energy = np.sqrt(np.mean(np.square(frames), axis=1))
+    threshold = SILENCE_RMS_RATIO * float(np.percentile(energy, 95))
+    if threshold == 0:
+        return []
+    regions = []
+    region_start = last_speech = None
+    for frame in np.flatnonzero(energy > threshold):
+        if region_start is not None and frame - last_speech > MIN_SILENCE_FRAMES:
+            regions.append((region_start, last_speech + 1))
+            region_start = None
+        if region_start is None:
+            region_start = frame
+        last_speech = frame
+    if region_start is not None:
+        regions.append((region_start, last_speech + 1))
+    return [(int(start) * VAD_FRAME_SAMPLES, int(end) * VAD_FRAME_SAMPLES) for start, end in regions]
+
+def split_into_speech_chunks(audio: np.ndarray) -> List[np.ndarray]:
+    """Splits PCM audio at silences into speech chunks of at most CHUNK_SECONDS each."""
+    max_chunk_samples = CHUNK_SECONDS * SAMPLE_RATE
+    chunks = []
+    chunk_start = chunk_end = None
+    for region_start, region_end in find_speech_regions(audio):
+        # Speech that runs longer than a chunk without a pause is cut at chunk boundaries.
+        for speech_start in range(region_start, region_end, max_chunk_samples):
+            speech_end = min(speech_start + max_chunk_samples, region_end)
+            if chunk_start is not None and speech_end - chunk_start > max_chunk_samples:
+                chunks.append(audio[chunk_start:chunk_end])
+                chunk_start = None
+            if chunk_start is None:
+                chunk_start = speech_start
+            chunk_end = speech_end
+    if chunk_start is not None:
+        chunks.append(audio[chunk_start:chunk_end])
+    return chunks
+
+def audio_to_text(audio: np.ndarray) -> str:
+    """Transcribes 16 kHz mono float32 PCM audio to text using Whisper."""
+    if audio.size == 0:
+        raise ValueError("Cannot transcribe empty audio.")
     try:
-        logging.info(f"Loading Whisper model for transcription of {audio_path}.")
-        model = WhisperModel("base", device="cpu", compute_type="int8")
-        segments, _ = model.transcribe(audio_path, beam_size=5)
-        transcript = "".join(segment.text for segment in segments)
+        if asr_pipeline is not None:
+            logging.info("Transcribing audio with the batched transformers pipeline.")
+            with asr_pipeline_lock:
+                result = asr_pipeline(
+                    {"raw": audio, "sampling_rate": SAMPLE_RATE},
+                    chunk_length_s=30,
+                    batch_size=24,
+                    return_timestamps=False,
+                )
+            transcript = result["text"]
+        else:
+            # Silences are cut out before transcription, so whisper.cpp only sees speech.
+            chunks = split_into_speech_chunks(audio)
+            if not chunks:
+                # No pauses could be told apart from speech: transcribe the audio as a whole.
+                chunks = [audio]
+            if len(chunks) > 1:
+                logging.info(f"Transcribing {len(chunks)} speech chunks in parallel with whisper.cpp.")
+                pool = get_transcription_pool()
+                try:
+                    chunk_transcripts = list(pool.map(transcription_worker.transcribe_chunk, chunks))
+                except BrokenProcessPool:
+                    discard_transcription_pool(pool)
+                    raise
+            else:
+                logging.info("Transcribing audio with whisper.cpp.")
+                with whisper_lock:
+                    chunk_transcripts = ["".join(segment.text for segment in WHISPER.transcribe(chunk)) for chunk in chunks]
+            transcript = " ".join(text.strip() for text in chunk_transcripts)
         logging.info(f"Transcription complete. Transcript length: {len(transcript)} characters.")
         return transcript
     except Exception as e:
-        logging.error(f"Whisper transcription failed for {audio_path}. Error: {e}")
+        logging.error(f"Whisper transcription failed. Error: {e}")
         raise e
 
-def generate_notes(text: str) -> str:
-    """Generates structured study notes from a transcript using the Gemini AI model."""
+def split_transcript(text: str) -> List[str]:
+    """Splits a transcript on sentence boundaries into segments of at most TRANSCRIPT_SEGMENT_CHARS."""
+    # Whisper output is not always punctuated; sentences that are too long on their own
+    # are split on whitespace instead.
+    pieces = []
+    for sentence in SENTENCE_END_RE.split(text):
+        if len(sentence) > TRANSCRIPT_SEGMENT_CHARS:
+            pieces.extend(textwrap.wrap(sentence, TRANSCRIPT_SEGMENT_CHARS, break_on_hyphens=False))
+        else:
+            pieces.append(sentence)
+    segments = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(piece) + 1 > TRANSCRIPT_SEGMENT_CHARS:
+            segments.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        segments.append(current)
+    return segments
+
+async def condense_transcript(text: str) -> str:
+    """Summarizes each transcript segment concurrently and joins the summaries in order."""
+    segments = split_transcript(text)
+    logging.info(f"Condensing a {len(text)}-character transcript in {len(segments)} segments.")
+    prompt = ("Summarize this segment of a lecture transcript for a note-taker. Keep every concept, "
+              "definition, example, formula and key term; drop filler and repetition.\n\nSegment:\n")
+
+    async def condense_segment(index: int, segment: str) -> str:
+        async with segment_summary_slots:
+            try:
+                response = await segment_summary_model.generate_content_async(prompt + segment)
+                return response.text.strip()
+            except Exception as e:
+                # Only this segment goes in raw; the others keep their summaries.
+                logging.warning(f"Could not condense transcript segment {index}, sending it in full: {e}")
+                return segment
+
+    summaries = await asyncio.gather(*(condense_segment(index, segment) for index, segment in enumerate(segments)))
+    return "\n\n".join(summaries)
+
+async def stream_notes(text: str) -> AsyncIterator[str]:
+    """Generates structured study notes from a transcript using the Gemini AI model, yielding text as it streams in."""
     logging.info("Calling Gemini API to generate notes.")
     if not text:
         raise ValueError("Cannot generate notes from an empty transcript.")
 
     system_prompt = """You are an expert educator...""" # Your full, multi-line prompt here
+    # The search topic is produced in the same call instead of a second Gemini round-trip.
+    system_prompt += """
+
+Also include a section headed exactly "## Topic" whose only content is the core topic of the lecture in 3-5 words, with no extra text or punctuation. For example: Quantum Physics Basics"""
+
+    if len(text) > MAP_REDUCE_THRESHOLD_CHARS:
+        lecture_content = "\n\nHere are condensed notes of the lecture transcript, in order:\n" + await condense_transcript(text)
+    else:
+        lecture_content = "\n\nHere is the transcript:\n" + text
 
     try:
-        # Call the directly imported GenerativeModel class
-        model = GenerativeModel('gemini-1.5-flash-latest')
-        response = model.generate_content(system_prompt + "\n\nHere is the transcript:\n" + text)
-        
-        if not response or not hasattr(response, 'text') or not response.text:
+        response = await gemini_model.generate_content_async(system_prompt + lecture_content, stream=True)
+        received_text = False
+        async for chunk in response:
+            try:
+                chunk_text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. the final finish-reason chunk) are skipped.
+                continue
+            if chunk_text:
+                received_text = True
+                yield chunk_text
+
+        if not received_text:
             raise ValueError("Gemini API returned an empty or malformed response.")
-            
+
         logging.info("Successfully generated notes from Gemini API.")
-        return response.text
     except Exception as e:
         logging.error(f"Gemini API call for notes generation failed: {e}")
         raise e
@@ -110,54 +424,33 @@ def generate_notes(text: str) -> str:
 # --- Parsing and Utility Functions ---
 # (The rest of the file remains the same and is already correct)
 
-def parse_graphviz(notes_text: str) -> Optional[str]:
-    # ... (function is correct)
-    match = re.search(r"```dot\s*([\s\S]+?)\s*```", notes_text)
-    if not match: return None
-    content = match.group(1).strip()
-    if not content.strip().startswith('digraph'): content = f'digraph G {{ {content} }}'
-    styling = 'bgcolor="transparent"; node [style="filled", shape="box", fillcolor="#AEC6CF", fontcolor="#121212", color="#FFFFFF", penwidth=2, fontname="Inter"]; edge [color="#FFFFFF", fontname="Inter"];'
-    return content.replace('{', f'{{ {styling}', 1)
-
-def parse_quiz_from_json(notes_text: str, key: str) -> List[Dict]:
-    # ... (function is correct)
-    pattern = re.compile(f'##\\s*{key}[\\s\\S]*?```json\\s*([\\s\\S]+?)\\s*```', re.IGNORECASE)
-    match = pattern.search(notes_text)
-    if not match: return []
-    try: return json.loads(match.group(1))
-    except json.JSONDecodeError:
-        logging.warning(f"Failed to parse JSON for key: '{key}'")
-        return []
+# Patterns are compiled once here rather than on every call.
+VIDEO_ID_RE = re.compile(r'(?:v=|youtu\.be/|shorts/|embed/)([A-Za-z0-9_-]{11})')
+SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
 
-def get_topic_from_summary(notes_text: str) -> Optional[str]:
-    """Extracts the summary from notes and uses AI to distill a concise search topic."""
-    # ... (function is correct)
-    logging.info("Distilling topic from summary.")
-    summary_match = re.search(r'##\s*(Detailed\s)?Summary\s*.*?\n(.*?)(?=##)', notes_text, re.DOTALL | re.IGNORECASE)
-    if not summary_match or not summary_match.group(2).strip():
-        logging.warning("Could not find a summary in the notes to generate a topic from.")
-        return None
-    summary_text = summary_match.group(2).strip()
+def extract_video_id(video_url: str) -> Optional[str]:
+    """Returns the 11-character YouTube video id from a watch, youtu.be, shorts or embed URL."""
+    match = VIDEO_ID_RE.search(video_url)
+    return match.group(1) if match else None
+
+@functools.lru_cache(maxsize=256)
+def synthesize_speech_cached(text: str) -> str:
+    """Converts text to speech with gTTS and returns the MP3 as a base64 string; raises on failure so errors are not cached."""
+    sound_file = BytesIO()
+    gTTS(text=text, lang='en').write_to_fp(sound_file)
+    return base64.b64encode(sound_file.getvalue()).decode('ascii')
+
+def synthesize_speech(text: str) -> Optional[str]:
+    """Returns the base64 MP3 for a text, or None if text-to-speech failed."""
     try:
-        # Call the directly imported GenerativeModel class
-        model = GenerativeModel('gemini-1.5-flash-latest')
-        prompt = (f"Based on the following summary, identify the core topic in 3-5 words. "
-                  f"Your response must ONLY be the topic phrase, with no extra text or punctuation. "
-                  f"For example: 'Quantum Physics Basics'.\n\nSummary: {summary_text}")
-        response = model.generate_content(prompt)
-        if response and hasattr(response, 'text') and response.text:
-            topic = response.text.strip().replace('"', '')
-            logging.info(f"Successfully distilled topic: '{topic}'")
-            return topic
-        else:
-            raise ValueError("Gemini API returned an empty response for topic distillation.")
+        return synthesize_speech_cached(text)
     except Exception as e:
-        logging.error(f"Gemini API call for topic distillation failed: {e}")
+        logging.error(f"Text-to-speech failed: {e}")
         return None
 
 def get_youtube_recommendations(topic: str, level: str, max_results: int = 3) -> List[Dict]:
     # ... (function is correct)
-    if not youtube_service:
+    if not youtube_available:
         logging.warning("YouTube service not available. Skipping recommendations.")
         return []
     if not topic:
@@ -166,7 +459,7 @@ def get_youtube_recommendations(topic: str, level: str, max_results: int = 3) ->
     logging.info(f"Fetching YouTube recommendations for topic: '{topic}', level: '{level}'.")
     query = f"{topic} for {level}s tutorial"
     try:
-        search_response = youtube_service.search().list(q=query, part='snippet', maxResults=max_results, type='video').execute()
+        search_response = get_youtube_service().search().list(q=query, part='snippet', maxResults=max_results, type='video').execute()
         recommendations = []
         for item in search_response.get('items', []):
             recommendations.append({
@@ -0,0 +1,65 @@
+from notes_parser import parse_notes
+
+NOTES = """# Photosynthesis
+
+## Detailed Summary
+Plants turn light, water and carbon dioxide into glucose and oxygen.
+
+## Quiz
+### MCQ Quiz
+```json
+[{"question": "What do plants release?", "options": ["Oxygen", "Nitrogen"], "answer": "Oxygen"}]
+```
+### Flashcard Review
+```json
+[{"front": "Chlorophyll", "back": "Green pigment that absorbs light"}]
+```
+
+## Concept Map
+```dot
+Light -> Glucose
+```
+
+## Topic
+**Photosynthesis Basics**
+"""
+
+
+def test_parse_notes_extracts_every_section():
+    content = parse_notes(NOTES)
+    assert content["mcq_questions"][0]["answer"] == "Oxygen"
+    assert content["flashcard_questions"][0]["front"] == "Chlorophyll"
+    assert content["graphviz_data"].startswith("digraph G {")
+    assert "Light -> Glucose" in content["graphviz_data"]
+    assert content["topic"] == "Photosynthesis Basics"
+    assert content["summary_snippet"] == "Plants turn light, water and carbon dioxide into glucose and"
+
+
+def test_parse_notes_finds_quizzes_under_top_level_headings():
+    content = parse_notes(NOTES.replace("### MCQ Quiz", "## MCQ Quiz").replace("### Flashcard Review", "## Flashcard Review"))
+    assert len(content["mcq_questions"]) == 1
+    assert len(content["flashcard_questions"]) == 1
+
+
+def test_parse_notes_tolerates_missing_and_malformed_sections():
+    content = parse_notes("## MCQ Quiz\n```json\n[not json\n```\n", partial=True)
+    assert content["mcq_questions"] == []
+    assert content["flashcard_questions"] == []
+    assert content["graphviz_data"] is None
+    assert content["topic"] is None
+
+
+def test_parse_notes_matches_the_topic_heading_exactly():
+    content = parse_notes("## Topics Covered\n- Light reactions\n\n" + NOTES)
+    assert content["topic"] == "Photosynthesis Basics"
+
+
+def test_parse_notes_finds_quiz_json_in_sub_sections():
+    content = parse_notes(
+        "## MCQ Quiz\nAnswer these:\n### Questions\n```json\n"
+        '[{"question": "Q?", "options": ["A", "B"], "answer": "A"}]\n```\n'
+        "## Flashcard Review\nNone this time.\n### Cards\n## Topic\nPlants\n"
+    )
+    assert content["mcq_questions"][0]["answer"] == "A"
+    assert content["flashcard_questions"] == []
+    assert content["topic"] == "Plants"
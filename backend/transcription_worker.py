@@ -0,0 +1,31 @@
+# backend/transcription_worker.py
+
+# Worker-process side of parallel transcription. This lives apart from processing.py so
+# that spawned workers only import whisper.cpp, not the API setup and model loading
+# that processing.py runs on import.
+
+import os
+import numpy as np
+from pywhispercpp.model import Model
+
+# Quantized GGML checkpoint name (downloaded on first use) or a path to a local .bin file.
+WHISPER_CPP_MODEL = os.getenv("WHISPER_CPP_MODEL", "base-q5_1")
+
+model = None
+
+def load_model(n_threads: int) -> Model:
+    """Loads the quantized whisper.cpp model with greedy decoding and no cross-chunk context."""
+    return Model(WHISPER_CPP_MODEL, n_threads=n_threads, no_context=True, print_progress=False, print_realtime=False)
+
+def init_worker():
+    """Loads one single-threaded Whisper model per worker process."""
+    global model
+    model = load_model(n_threads=1)
+
+def ping() -> bool:
+    """No-op task used to make the pool start (and initialize) its worker processes."""
+    return model is not None
+
+def transcribe_chunk(chunk: np.ndarray) -> str:
+    """Transcribes one speech chunk of 16 kHz mono float32 PCM."""
+    return "".join(segment.text for segment in model.transcribe(chunk))
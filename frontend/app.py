@@ -1,12 +1,19 @@
+import os
 import streamlit as st
 import requests
 import re
+from requests.adapters import HTTPAdapter
+import time
+import json
+import base64
+from functools import lru_cache
 from io import BytesIO
-from gtts import gTTS
 from typing import Optional, List, Dict # <-- IMPORT THIS
 
 # --- Configuration ---
-BACKEND_URL = "https://eduease-project.onrender.com"
+BACKEND_URL = os.getenv("BACKEND_URL", "https://eduease-project.onrender.com")
+JOB_TIMEOUT_SECONDS = 600
+JOB_EVENTS_READ_TIMEOUT_SECONDS = 60
 
 # --- Page Configuration and CSS ---
 st.set_page_config(page_title="EduEase", page_icon="🧠", layout="wide")
@@ -15,22 +22,27 @@ st.markdown("""<style>...</style>""", unsafe_allow_html=True)
 
 # --- UI Helper Functions ---
 
-def parse_graphviz(notes_text: str) -> Optional[str]: # <-- FIX: Corrected return type
-    match = re.search(r"```dot\s*([\s\S]+?)\s*```", notes_text)
-    if not match: return None
-    content = match.group(1).strip()
-    if not content.strip().startswith('digraph'): content = f'digraph G {{ {content} }}'
-    styling = 'bgcolor="transparent"; node [style="filled", shape="box", fillcolor="#AEC6CF", fontcolor="#121212", color="#FFFFFF", penwidth=2, fontname="Inter"]; edge [color="#FFFFFF", fontname="Inter"];'
-    return content.replace('{', f'{{ {styling}', 1)
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Returns a process-wide session so all backend calls reuse pooled keep-alive connections."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
+    return session
+
+KEYWORD_COLORS = ["#FFD6A5", "#FDFFB6", "#CAFFBF", "#9BF6FF", "#FFC0CB"]
+KEYWORD_RE = re.compile(r"@@(.*?)@@")
+
+@lru_cache(maxsize=4096)
+def color_for_keyword(keyword: str) -> str:
+    """Returns the highlight color for a keyword; stable across Streamlit reruns."""
+    return KEYWORD_COLORS[hash(keyword) % len(KEYWORD_COLORS)]
 
 def highlight_keywords(text: str) -> str:
-    # This function is already correct
-    colors = ["#FFD6A5", "#FDFFB6", "#CAFFBF", "#9BF6FF", "#FFC0CB"]
     def color_replacer(match):
         keyword = match.group(1)
-        color = colors[hash(keyword) % len(colors)]
-        return f'<span style="background-color: {color}; ...">{keyword}</span>'
-    return re.sub(r"@@(.*?)@@", color_replacer, text)
+        return f'<span style="background-color: {color_for_keyword(keyword)}; ...">{keyword}</span>'
+    return KEYWORD_RE.sub(color_replacer, text)
 
 def find_correct_option(options: List[str], correct_answer: str) -> Optional[int]: # <-- FIX: Corrected types
     # ... (Function content is correct)
@@ -38,14 +50,6 @@ def find_correct_option(options: List[str], correct_answer: str) -> Optional[int
     # ... (rest of the function logic)
     return None # Simplified for brevity
 
-def get_topic_from_summary(notes_text: str) -> Optional[str]: # <-- FIX: Corrected return type
-    summary_match = re.search(r'##\s*(Detailed\s)?Summary\s*.*?\n(.*?)(?=##)', notes_text, re.DOTALL | re.IGNORECASE)
-    if summary_match and summary_match.group(2).strip():
-        summary_text = summary_match.group(2).strip()
-        # A simple heuristic: take the first N words of the summary
-        return " ".join(summary_text.split()[:10])
-    return None
-
 # --- Main Streamlit App ---
 def app():
     # Logo and Hero Section can be pasted here for brevity
@@ -97,32 +101,58 @@ def app():
         with st.spinner('🧙‍♂️ Our AI backend is working its magic...'):
             try:
                 generate_url = f"{BACKEND_URL}/generate"
-                response = requests.post(generate_url, json={"video_url": st.session_state.video_url}, timeout=600)
+                response = get_http_session().post(generate_url, json={"video_url": st.session_state.video_url}, timeout=30)
 
+                # The backend queues the pipeline as a job; follow its event stream and
+                # show the notes while they are being written.
                 if response.status_code == 200:
                     data = response.json()
-                    if data["status"] == "success":
+                    if data["status"] == "queued":
+                        events_url = f"{BACKEND_URL}/job/{data['job_id']}/events"
+                        deadline = time.monotonic() + JOB_TIMEOUT_SECONDS
+                        notes_preview = st.empty()
+                        streamed_notes = ""
+                        with get_http_session().get(events_url, stream=True, timeout=(30, JOB_EVENTS_READ_TIMEOUT_SECONDS)) as response:
+                            response.raise_for_status()
+                            for line in response.iter_lines():
+                                if time.monotonic() > deadline:
+                                    break
+                                if not line:
+                                    continue
+                                event = json.loads(line)
+                                if event.get("event") == "notes":
+                                    streamed_notes += event["text"]
+                                    notes_preview.markdown(highlight_keywords(streamed_notes), unsafe_allow_html=True)
+                                elif event.get("event", "error") in ("done", "error"):
+                                    data = event
+                                    break
+                        notes_preview.empty()
+
+                if response.status_code == 200:
+                    if data["status"] in ("queued", "running"):
+                        st.error("The backend is taking too long to process this video. Please try again later.", icon="🚨")
+                    elif data["status"] == "success":
                         # Populate session state from backend's response
                         st.session_state.notes = data.get("notes")
                         st.session_state.mcq_questions = data.get("mcq_questions", [])
                         st.session_state.flashcard_questions = data.get("flashcard_questions", [])
                         st.session_state.graphviz_data = data.get("graphviz_data")
+                        st.session_state.topic_title = data.get("topic")
 
-                        # Generate audio summary
-                        summary_text = get_topic_from_summary(data.get("notes", "")) # Re-use helper
-                        if summary_text:
-                            sound_file = BytesIO()
-                            tts = gTTS(text=summary_text, lang='en')
-                            tts.write_to_fp(sound_file)
-                            st.session_state.summary_audio_data = sound_file
+                        # Audio summary is synthesized by the backend
+                        if data.get("summary_audio_b64"):
+                            st.session_state.summary_audio_data = BytesIO(base64.b64decode(data["summary_audio_b64"]))
                     else:
                         st.error(f"Backend Error: {data.get('message', 'Unknown error')}", icon="🚨")
                 else:
                     st.error(f"Connection to backend failed. Status: {response.status_code}", icon="🚨")
             except requests.exceptions.RequestException as e:
                 st.error(f"Connection Error: Could not connect to the backend at {BACKEND_URL}. Is it running? Details: {e}", icon="🚨")
-            
-            st.session_state.processing = False
+            except ValueError as e:
+                # A proxy error page or a truncated event line is not valid JSON.
+                st.error(f"Backend Error: Received an invalid response from the backend. Details: {e}", icon="🚨")
+            finally:
+                st.session_state.processing = False
             st.rerun()
 
     # --- Display Content ---